@@ -0,0 +1,213 @@
+"""
+batch_banners.py – Renders every banner variant in a JSON spec file using Pillow
+
+Each variant is drawn in a process pool with cached fonts and encoded straight
+to its target formats (JPEG/PNG/WebP) from memory. Variants whose spec hash is
+unchanged since the last run are skipped.
+
+Usage:
+    python batch_banners.py banners.json --out banners/ --workers 4
+
+Spec file: a list of variants, or {"defaults": {...}, "banners": [...]}, e.g.
+    {
+      "defaults": {"formats": ["jpeg", "webp"]},
+      "banners": [
+        {"name": "pact_github", "width": 1500, "height": 400},
+        {"name": "ethan_x", "width": 1500, "height": 500, "subtitle": "Ethan – Automation"},
+        {"name": "mission_square", "width": 1080, "height": 1080, "formats": ["png"]}
+      ]
+    }
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import hashlib
+import argparse
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Bump when the drawing code changes so every output is re-rendered
+RENDER_VERSION = 1
+MANIFEST_NAME = ".banner_manifest.json"
+
+# Same look as create_banner.py; positions and sizes are for a 1500x400 canvas
+DEFAULTS = {
+    "width": 1500,
+    "height": 400,
+    "title": "PROGRAMMING PACT",
+    "subtitle": "Automation. Brotherhood. Cybersecurity. Creation.",
+    "font": "DejaVuSans-Bold.ttf",
+    "title_size": 80,
+    "subtitle_size": 30,
+    "title_pos": [150, 100],
+    "subtitle_pos": [150, 220],
+    "background": [10, 10, 10],
+    "title_color": [0, 255, 200],
+    "subtitle_color": [100, 255, 255],
+    "formats": ["jpeg"],
+    "quality": 90,
+}
+BASE_SIZE = (1500, 400)
+
+FORMATS = {
+    "jpeg": ("JPEG", ".jpg"),
+    "jpg": ("JPEG", ".jpg"),
+    "png": ("PNG", ".png"),
+    "webp": ("WEBP", ".webp"),
+}
+
+
+@lru_cache(maxsize=None)
+def get_font(path, size):
+    """Loads a font once per worker process, falling back to Pillow's default."""
+    try:
+        return ImageFont.truetype(path, size)
+    except IOError:
+        return ImageFont.load_default()
+
+
+def spec_hash(spec):
+    payload = json.dumps({"v": RENDER_VERSION, "spec": spec}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def output_paths(spec, out_dir):
+    return [os.path.join(out_dir, spec["name"] + FORMATS[fmt.lower()][1]) for fmt in spec["formats"]]
+
+
+def render(spec, out_dir):
+    """
+    Draws one banner and writes each requested format from an in-memory buffer.
+
+    Text positions and sizes from the spec are scaled from the 1500x400 base
+    layout so the same variant works for any platform size.
+    """
+    width, height = spec["width"], spec["height"]
+    scale = min(width / BASE_SIZE[0], height / BASE_SIZE[1])
+    img = Image.new("RGB", (width, height), color=tuple(spec["background"]))
+    draw = ImageDraw.Draw(img)
+
+    for key in ("title", "subtitle"):
+        if not spec[key]:
+            continue
+        font = get_font(spec["font"], max(1, round(spec[key + "_size"] * scale)))
+        x, y = (round(v * scale) for v in spec[key + "_pos"])
+        draw.text((x, y), spec[key], font=font, fill=tuple(spec[key + "_color"]))
+
+    for fmt, path in zip(spec["formats"], output_paths(spec, out_dir)):
+        pil_format = FORMATS[fmt.lower()][0]
+        buf = io.BytesIO()
+        options = {"quality": spec["quality"]} if pil_format in ("JPEG", "WEBP") else {}
+        img.save(buf, format=pil_format, **options)
+        with open(path, "wb") as f:
+            f.write(buf.getvalue())
+    return spec["name"]
+
+
+def load_specs(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        defaults, banners = {}, data
+    else:
+        defaults, banners = data.get("defaults", {}), data["banners"]
+
+    if not isinstance(defaults, dict) or not isinstance(banners, list):
+        raise ValueError("expected a list of banners or {\"defaults\": {...}, \"banners\": [...]}")
+
+    specs = []
+    seen_names = set()
+    for banner in banners:
+        if not isinstance(banner, dict):
+            raise ValueError(f"Banner variant is not an object: {banner!r}")
+        spec = {**DEFAULTS, **defaults, **banner}
+        if "name" not in spec:
+            raise ValueError(f"Banner variant without a name: {banner}")
+        name = spec["name"]
+        # Names become file names inside the output folder
+        if not isinstance(name, str) or name in ("", ".", "..") or any(sep in name for sep in ("/", "\\", os.sep)):
+            raise ValueError(f"invalid banner name {name!r}")
+        if name in seen_names:
+            raise ValueError(f"duplicate banner name {name!r}")
+        seen_names.add(name)
+        unknown = [fmt for fmt in spec["formats"] if fmt.lower() not in FORMATS]
+        if unknown:
+            raise ValueError(f"{spec['name']}: unsupported format(s) {unknown}")
+        # "jpg" and "jpeg" write the same file; keep the first format per extension
+        formats, extensions = [], set()
+        for fmt in spec["formats"]:
+            ext = FORMATS[fmt.lower()][1]
+            if ext not in extensions:
+                extensions.add(ext)
+                formats.append(fmt)
+        spec["formats"] = formats
+        specs.append(spec)
+    return specs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render banner variants from a JSON spec file.")
+    parser.add_argument("spec", help="Path to the banner spec JSON")
+    parser.add_argument("--out", "-o", default="banners", help="Output folder")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--force", "-f", action="store_true", help="Re-render even if the spec is unchanged")
+    args = parser.parse_args()
+
+    try:
+        specs = load_specs(args.spec)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: could not read spec file: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    os.makedirs(args.out, exist_ok=True)
+    manifest_path = os.path.join(args.out, MANIFEST_NAME)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    todo = []
+    for spec in specs:
+        digest = spec_hash(spec)
+        up_to_date = manifest.get(spec["name"]) == digest and all(
+            os.path.exists(p) for p in output_paths(spec, args.out)
+        )
+        if args.force or not up_to_date:
+            todo.append((spec, digest))
+
+    start = time.perf_counter()
+    images = 0
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(render, spec, args.out): (spec, digest) for spec, digest in todo}
+        for future, (spec, digest) in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Failed to render {spec['name']}: {e}", file=sys.stderr)
+                manifest.pop(spec["name"], None)
+                failed += 1
+                continue
+            manifest[spec["name"]] = digest
+            images += len(spec["formats"])
+    elapsed = time.perf_counter() - start
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    rate = images / elapsed if elapsed > 0 else 0.0
+    print(f"Rendered {len(todo) - failed} of {len(specs)} variants "
+          f"({len(specs) - len(todo)} unchanged, skipped; {failed} failed)")
+    print(f"{images} images in {elapsed:.2f}s – {rate:.1f} images/sec")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+import os
+import re
+import sys
+import mmap
+import json
+import bisect
+import argparse
+from datetime import datetime
+
+INDEX_VERSION = 3
+CHECKPOINT_SECONDS = 60  # one timestamp -> byte offset checkpoint per minute
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+LINE_RE = re.compile(rb"^\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] ?(.*)$")
+
+# Event types counted per session; a line counts towards every type it matches
+EVENT_PATTERNS = [
+    ("online", re.compile(r"Online$")),
+    ("standdown", re.compile(r"Standing down")),
+    ("connected", re.compile(r"Connected to KRPC|Connection established")),
+    # "KRPC Disconnected" is the older script's normal teardown, not a connection loss
+    ("teardown", re.compile(r"KRPC Disconnected")),
+    ("disconnect", re.compile(r"Connection failed|WinError 10053")),
+    ("failure", re.compile(r"^Critical failure")),
+    ("launch", re.compile(r"Launch phase initiated|Initiating smart launch sequence")),
+    ("circularize", re.compile(r"[Cc]irculariz")),
+    ("staging", re.compile(r"^Staging:|separated ->")),
+    ("shutdown", re.compile(r"[Ss]hutdown|signal \(?\d")),
+]
+
+
+def classify(message):
+    """Return every event type a log message matches (empty if it is uncategorised)."""
+    return [name for name, pattern in EVENT_PATTERNS if pattern.search(message)]
+
+
+def parse_ts(ts):
+    return datetime.strptime(ts, TS_FORMAT)
+
+
+def iter_records(buf, start, end):
+    """
+    Yields (offset, timestamp, message) for every `[timestamp] message` line in buf[start:end].
+
+    Lines without a timestamp (e.g. KRPC server stack traces) are skipped.
+    """
+    pos = start
+    while pos < end:
+        nl = buf.find(b"\n", pos, end)
+        line_end = end if nl == -1 else nl
+        m = LINE_RE.match(buf[pos:line_end].rstrip(b"\r"))
+        if m:
+            yield pos, m.group(1).decode(), m.group(2).decode("utf-8", "replace")
+        pos = line_end + 1
+
+
+class FlightLog:
+    """
+    Memory-mapped view of oberon_log.txt with a JSON sidecar index.
+
+    The index records session boundaries ("... Online" to "Standing down", the
+    next "Online", or end of file), per-session event counts and first-seen
+    times, and sparse timestamp byte offsets. It is extended incrementally from
+    the last indexed byte whenever the log has grown, and rebuilt if the log
+    was truncated or replaced.
+    """
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._file = open(path, "rb")
+        self.buf = b""
+        self.index = self._load_index()
+        self.update()
+
+    def _remap(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size == len(self.buf):
+            return
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+        # mmap cannot map an empty file
+        self.buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def close(self):
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Index maintenance ---
+    def _empty_index(self):
+        return {"version": INDEX_VERSION, "size": 0, "head": "", "sessions": [], "checkpoints": []}
+
+    def _head(self):
+        return self.buf[:64].hex()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return self._empty_index()
+        if index.get("version") != INDEX_VERSION:
+            return self._empty_index()
+        return index
+
+    def update(self):
+        """Index any bytes appended since the last run. Returns the number of new records."""
+        self._remap()
+        size = len(self.buf)
+        idx = self.index
+        if size < idx["size"] or (idx["size"] and self._head()[: len(idx["head"])] != idx["head"]):
+            idx = self.index = self._empty_index()
+        # Only index complete lines; a partially written last line is picked up next time
+        end = self.buf.rfind(b"\n", idx["size"], size) + 1 if size > idx["size"] else 0
+        if end <= idx["size"]:
+            return 0
+
+        sessions = idx["sessions"]
+        checkpoints = idx["checkpoints"]
+        last_cp = parse_ts(checkpoints[-1][0]) if checkpoints else None
+        count = 0
+        for offset, ts, message in iter_records(self.buf, idx["size"], end):
+            count += 1
+            dt = parse_ts(ts)
+            if last_cp is None or (dt - last_cp).total_seconds() >= CHECKPOINT_SECONDS:
+                checkpoints.append([ts, offset])
+                last_cp = dt
+            events = classify(message)
+            current = sessions[-1] if sessions else None
+            if "online" in events or current is None or current["closed"]:
+                current = {"start": ts, "end": ts, "start_offset": offset, "end_offset": offset,
+                           "records": 0, "closed": False, "events": {}}
+                sessions.append(current)
+            current["end"] = ts
+            # end_offset is exclusive: the byte after the session's last line
+            current["end_offset"] = self.buf.find(b"\n", offset, end) + 1
+            current["records"] += 1
+            for event in events:
+                seen = current["events"].setdefault(event, {"count": 0, "first": ts})
+                seen["count"] += 1
+            if "standdown" in events:
+                current["closed"] = True
+
+        idx["size"] = end
+        idx["head"] = self._head()
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(idx, f)
+        os.replace(tmp, self.index_path)
+        return count
+
+    # --- Queries ---
+    @property
+    def sessions(self):
+        return self.index["sessions"]
+
+    def records_between(self, start=None, end=None):
+        """Yields (timestamp, message) for records with start <= timestamp <= end."""
+        stop = self.index["size"]
+        offset = 0
+        checkpoints = self.index["checkpoints"]
+        if start and checkpoints:
+            i = bisect.bisect_left([cp[0] for cp in checkpoints], start)
+            offset = checkpoints[max(i - 1, 0)][1]
+        for _, ts, message in iter_records(self.buf, offset, stop):
+            if start and ts < start:
+                continue
+            if end and ts > end:
+                break
+            yield ts, message
+
+    def session_records(self, n):
+        """Yields (timestamp, message) for session number n (0-based)."""
+        s = self.sessions[n]
+        for _, ts, message in iter_records(self.buf, s["start_offset"], s["end_offset"]):
+            yield ts, message
+
+    def event_counts(self, start=None, end=None):
+        """Totals per event type across sessions starting within [start, end]."""
+        totals = {}
+        for _, s in self.select(start, end):
+            for name, seen in s["events"].items():
+                totals[name] = totals.get(name, 0) + seen["count"]
+        return totals
+
+    def phase_durations(self, from_event, to_event, start=None, end=None):
+        """Seconds from the first `from_event` to the first later `to_event`, per session."""
+        durations = []
+        for _, s in self.select(start, end):
+            a = s["events"].get(from_event)
+            b = s["events"].get(to_event)
+            if a and b and b["first"] >= a["first"]:
+                durations.append((s["start"], (parse_ts(b["first"]) - parse_ts(a["first"])).total_seconds()))
+        return durations
+
+    def disconnect_rate(self, start=None, end=None):
+        selected = [s for _, s in self.select(start, end)]
+        if not selected:
+            return 0.0
+        return sum(1 for s in selected if "disconnect" in s["events"]) / len(selected)
+
+    def select(self, start=None, end=None):
+        """Yields (number, session) for sessions starting within [start, end]."""
+        for n, s in enumerate(self.sessions):
+            if (start is None or s["start"] >= start) and (end is None or s["start"] <= end):
+                yield n, s
+
+
+def main():
+    """
+    Command-line interface for querying the KRPC2 flight log.
+
+    Subcommands:
+        sessions   – list sessions with duration, record count and outcome
+        range      – print records between --start and --end
+        session N  – print all records of session N
+        events     – event-type totals (optionally one --type)
+        durations  – per-session time between two event types, e.g. launch -> circularize
+        stats      – session count, failures and disconnect rate
+    """
+    parser = argparse.ArgumentParser(description="Query oberon_log.txt flight logs via a sidecar index.")
+    parser.add_argument("--log", default="oberon_log.txt", help="Path to the flight log")
+    parser.add_argument("--start", help="Earliest timestamp, e.g. '2025-04-24 13:00:00'")
+    parser.add_argument("--end", help="Latest timestamp")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("sessions")
+    sub.add_parser("range")
+    p_session = sub.add_parser("session")
+    p_session.add_argument("number", type=int)
+    p_events = sub.add_parser("events")
+    p_events.add_argument("--type", choices=[name for name, _ in EVENT_PATTERNS])
+    p_dur = sub.add_parser("durations")
+    p_dur.add_argument("--from", dest="from_event", default="launch")
+    p_dur.add_argument("--to", dest="to_event", default="circularize")
+    sub.add_parser("stats")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.log):
+        print(f"Error: '{args.log}' is not a file.", file=sys.stderr)
+        sys.exit(1)
+
+    with FlightLog(args.log) as log:
+        if args.command == "sessions":
+            for i, s in log.select(args.start, args.end):
+                secs = (parse_ts(s["end"]) - parse_ts(s["start"])).total_seconds()
+                outcome = "stood down" if s["closed"] else ("failed" if "failure" in s["events"] else "open")
+                print(f"{i:4d}  {s['start']}  {secs:7.0f}s  {s['records']:5d} records  {outcome}")
+        elif args.command == "range":
+            for ts, message in log.records_between(args.start, args.end):
+                print(f"[{ts}] {message}")
+        elif args.command == "session":
+            if not 0 <= args.number < len(log.sessions):
+                print(f"Error: no session {args.number} ({len(log.sessions)} sessions).", file=sys.stderr)
+                sys.exit(1)
+            for ts, message in log.session_records(args.number):
+                print(f"[{ts}] {message}")
+        elif args.command == "events":
+            counts = log.event_counts(args.start, args.end)
+            names = [args.type] if args.type else sorted(counts)
+            for name in names:
+                print(f"{name:12s} {counts.get(name, 0)}")
+        elif args.command == "durations":
+            durations = log.phase_durations(args.from_event, args.to_event, args.start, args.end)
+            for started, secs in durations:
+                print(f"{started}  {secs:7.0f}s")
+            if durations:
+                avg = sum(d for _, d in durations) / len(durations)
+                print(f"\n{len(durations)} sessions, mean {args.from_event} -> {args.to_event}: {avg:.1f}s")
+            else:
+                print(f"No sessions with both '{args.from_event}' and '{args.to_event}'.")
+        elif args.command == "stats":
+            selected = [s for _, s in log.select(args.start, args.end)]
+            counts = log.event_counts(args.start, args.end)
+            print(f"Sessions           : {len(selected)}")
+            print(f"Stood down cleanly : {sum(1 for s in selected if s['closed'])}")
+            print(f"Critical failures  : {counts.get('failure', 0)}")
+            print(f"Disconnect rate    : {log.disconnect_rate(args.start, args.end):.0%}")
+
+if __name__ == "__main__":
+    main()
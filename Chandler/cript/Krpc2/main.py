@@ -1,13 +1,17 @@
-import os
 import time
+_IMPORT_START = time.perf_counter()
+
+import os
 import math
 import krpc
-import torch
 import logging
 import signal
+import threading
 import numpy as np
 from collections import deque
-from transformers import GPT2Tokenizer, GPTNeoForCausalLM, BitsAndBytesConfig
+
+# torch/transformers are imported by ModelLoader, off the control thread
+IMPORT_TIME = time.perf_counter() - _IMPORT_START
 
 # --- Constants & Configuration ---
 class Config:
@@ -19,14 +23,62 @@ class Config:
         'structural': 0.8
     }
     UPDATE_INTERVAL = 0.1  # seconds
+    LAZY_MODEL_LOAD = True  # load the LLM on a background thread
+
+# Returned to subsystems that ask the LLM before it has finished loading
+LLM_NOT_READY = "LLM not ready"
 
 # --- Quantization Setup ---
-quant_config = BitsAndBytesConfig(
-    load_in_4bit=True,
-    bnb_4bit_use_double_quant=True,
-    bnb_4bit_quant_type="nf4",
-    bnb_4bit_compute_dtype=torch.float16
-)
+def build_quant_config():
+    import torch
+    from transformers import BitsAndBytesConfig
+    return BitsAndBytesConfig(
+        load_in_4bit=True,
+        bnb_4bit_use_double_quant=True,
+        bnb_4bit_quant_type="nf4",
+        bnb_4bit_compute_dtype=torch.float16
+    )
+
+class ModelLoader:
+    """Imports torch/transformers and loads the quantized model and tokenizer.
+
+    With background=True the work runs on a daemon thread so control and
+    telemetry can start immediately; check `ready` before using the model.
+    """
+    def __init__(self, background=True):
+        self.model = None
+        self.tokenizer = None
+        self.error = None
+        self.load_time = None
+        self.ready = threading.Event()
+        if background:
+            self.thread = threading.Thread(target=self._load, name="ModelLoader", daemon=True)
+            self.thread.start()
+        else:
+            self.thread = None
+            self._load()
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            from transformers import GPT2Tokenizer, GPTNeoForCausalLM
+            model = GPTNeoForCausalLM.from_pretrained(
+                "EleutherAI/gpt-neo-1.3B",
+                revision="4bit",
+                quantization_config=build_quant_config(),
+                low_cpu_mem_usage=True
+            )
+            tokenizer = GPT2Tokenizer.from_pretrained('gpt2')
+            self.model, self.tokenizer = model, tokenizer
+        except Exception as e:
+            self.error = e
+            print(f"Model load failed: {e}")
+        finally:
+            self.load_time = time.perf_counter() - start
+            self.ready.set()
+
+    def is_ready(self):
+        return self.ready.is_set() and self.error is None
 
 class ResourceManager:
     def __init__(self, vessel):
@@ -84,13 +136,12 @@ class LandingSequence:
         self._calculate_suicide_burn()
 
 class HybridPilot:
-    def __init__(self, conn):
+    def __init__(self, conn, lazy=None):
         self.conn = conn
         self.vessel = conn.space_center.active_vessel
         self.sc = conn.space_center
         self.body = self.vessel.orbit.body
-        self.model = self._load_quantized_model()
-        self.tokenizer = GPT2Tokenizer.from_pretrained('gpt2')
+        self.loader = ModelLoader(background=Config.LAZY_MODEL_LOAD if lazy is None else lazy)
         self.decision_cache = {}
         
         # Subsystems
@@ -99,13 +150,28 @@ class HybridPilot:
         self.emergency = EmergencySystem(self)
         self.resources = ResourceManager(self.vessel)
 
-    def _load_quantized_model(self):
-        return GPTNeoForCausalLM.from_pretrained(
-            "EleutherAI/gpt-neo-1.3B",
-            revision="4bit",
-            quantization_config=quant_config,
-            low_cpu_mem_usage=True
-        )
+    @property
+    def model(self):
+        return self.loader.model
+
+    @property
+    def tokenizer(self):
+        return self.loader.tokenizer
+
+    def llm_ready(self):
+        return self.loader.is_ready()
+
+    def ask_llm(self, prompt, max_new_tokens=20):
+        """Query the model, or return LLM_NOT_READY while it is still loading."""
+        if not self.llm_ready():
+            return LLM_NOT_READY
+        if prompt in self.decision_cache:
+            return self.decision_cache[prompt]
+        inputs = self.tokenizer(prompt, return_tensors="pt")
+        out = self.model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False)
+        decision = self.tokenizer.decode(out[0], skip_special_tokens=True)
+        self.decision_cache[prompt] = decision
+        return decision
 
 class NavigationSystem:
     def __init__(self, vessel):
@@ -168,15 +234,26 @@ class SystemMonitor:
 
 # --- Main Execution ---
 if __name__ == "__main__":
+    print(f"Module import time: {IMPORT_TIME * 1000:.1f} ms")
+    start = time.perf_counter()
     conn = krpc.connect(name="KSP AI Pilot")
     pilot = HybridPilot(conn)
     controller = MissionController(pilot)
     monitor = SystemMonitor(pilot)
+    first_tick = True
+    llm_reported = False
     
     try:
         while True:
             controller.update()
             monitor.run_checks()
+            if first_tick:
+                print(f"First telemetry tick after {time.perf_counter() - start:.2f} s")
+                first_tick = False
+            if not llm_reported and pilot.loader.ready.is_set():
+                status = "ready" if pilot.llm_ready() else f"unavailable ({pilot.loader.error})"
+                print(f"LLM {status} after {pilot.loader.load_time:.2f} s")
+                llm_reported = True
             time.sleep(Config.UPDATE_INTERVAL)
     except KeyboardInterrupt:
         print("Mission terminated by operator")
\ No newline at end of file
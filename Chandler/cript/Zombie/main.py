@@ -1,4 +1,9 @@
 import time
+import argparse
+import traceback
+import functools
+import multiprocessing as mp
+from multiprocessing import shared_memory
 import numpy as np
 import mss
 import cv2
@@ -10,19 +15,21 @@ import gymnasium as gym
 from gymnasium import spaces
 from stable_baselines3 import DQN
 from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import VecEnv
 
 from transformers import GPT2LMHeadModel, GPT2TokenizerFast
 
 # --- Custom Gym Environment ---
 class BlackOpsZombiesEnv(gym.Env):
-    def __init__(self):
+    def __init__(self, monitor=1, region=None):
         super().__init__()
         # Observation: grayscale 84×84
         self.observation_space = spaces.Box(0, 255, (84, 84, 1), dtype=np.uint8)
         # Actions: W, A, S, D, shoot, aim
         self.action_space = spaces.Discrete(6)
         self.sct = mss.mss()
-        self.monitor = self.sct.monitors[1]
+        # region: {"left", "top", "width", "height"} of one game window
+        self.monitor = region or self.sct.monitors[monitor]
         # Simple state for GPT-2 prompts
         self.state = {"round": 1, "ammo": 30}
 
@@ -64,6 +71,213 @@ class BlackOpsZombiesEnv(gym.Env):
             time.sleep(0.05)
             pyautogui.mouseUp(button=code)
 
+# --- Recorded-replay Environment (no game or input injection needed) ---
+class ReplayZombiesEnv(gym.Env):
+    def __init__(self, path):
+        super().__init__()
+        self.observation_space = spaces.Box(0, 255, (84, 84, 1), dtype=np.uint8)
+        self.action_space = spaces.Discrete(6)
+        # Recorded frames: uint8 array of shape (N, 84, 84, 1) saved with np.save
+        self.frames = np.load(path, mmap_mode="r")
+        if self.frames.shape[1:] != (84, 84, 1) or self.frames.dtype != np.uint8:
+            raise ValueError(
+                f"{path}: replay must be a uint8 array of shape (N, 84, 84, 1), "
+                f"got {self.frames.dtype} {self.frames.shape}"
+            )
+        if len(self.frames) < 2:
+            raise ValueError(f"{path}: replay needs at least 2 frames, got {len(self.frames)}")
+        self.pos = 0
+        self.state = {"round": 1, "ammo": 30}
+
+    def reset(self, **kwargs):
+        self.pos = 0
+        return np.array(self.frames[0]), {}
+
+    def step(self, action):
+        self.pos += 1
+        truncated = self.pos >= len(self.frames) - 1
+        return np.array(self.frames[self.pos]), 1.0, False, truncated, {}
+
+# --- Vectorized Environment over Shared Memory ---
+def _run_command(env, cmd, data, obs_buf, index):
+    if cmd == "step":
+        obs, reward, terminated, truncated, info = env.step(data)
+        done = terminated or truncated
+        if done:
+            info["terminal_observation"] = obs
+            info["TimeLimit.truncated"] = truncated and not terminated
+            obs, _ = env.reset()
+        obs_buf[index] = obs
+        return reward, done, info
+    if cmd == "reset":
+        obs, _ = env.reset()
+        obs_buf[index] = obs
+        return None
+    if cmd == "get_attr":
+        return getattr(env, data)
+    if cmd == "set_attr":
+        setattr(env, data[0], data[1])
+        return None
+    if cmd == "env_method":
+        name, args, kwargs = data
+        return getattr(env, name)(*args, **kwargs)
+    raise ValueError(f"Unknown command {cmd!r}")
+
+def _recv_all(remotes):
+    # Drain every pipe before raising so the workers stay in step with the parent
+    replies = [remote.recv() for remote in remotes]
+    for status, payload in replies:
+        if status == "error":
+            raise payload
+    return [payload for _, payload in replies]
+
+def _shm_worker(remote, parent_remote, env_fn, shm_name, shape, index):
+    parent_remote.close()
+    try:
+        env, init_error = env_fn(), None
+    except Exception as e:
+        env, init_error = None, RuntimeError(f"env {index} failed to start: {e!r}\n{traceback.format_exc()}")
+    shm = shared_memory.SharedMemory(name=shm_name)
+    obs_buf = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "close":
+                if env is not None:
+                    env.close()
+                break
+            if init_error is not None:
+                remote.send(("error", init_error))
+                continue
+            try:
+                result = _run_command(env, cmd, data, obs_buf, index)
+            except Exception as e:
+                # Hand the error to the parent instead of dying with a bare EOFError there;
+                # AttributeError keeps its type so get_attr probes (e.g. render_mode) still work
+                error_type = AttributeError if isinstance(e, AttributeError) else RuntimeError
+                remote.send(("error", error_type(f"env {index} {cmd} failed: {e!r}\n{traceback.format_exc()}")))
+            else:
+                remote.send(("ok", result))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        del obs_buf
+        shm.close()
+        remote.close()
+
+class SharedMemoryVecEnv(VecEnv):
+    """
+    Runs one env per worker process. Observations are written straight into a
+    shared (n_envs, 84, 84, 1) uint8 array, so only actions, rewards and infos
+    cross the pipes and the policy gets one batch for a single forward pass.
+    """
+    def __init__(self, env_fns):
+        n_envs = len(env_fns)
+        observation_space = spaces.Box(0, 255, (84, 84, 1), dtype=np.uint8)
+        shape = (n_envs,) + observation_space.shape
+        self.shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        self.processes = []
+        try:
+            self.obs = np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf)
+            ctx = mp.get_context("spawn")
+            self.remotes, work_remotes = zip(*[ctx.Pipe() for _ in range(n_envs)])
+            for i, (work_remote, remote, env_fn) in enumerate(zip(work_remotes, self.remotes, env_fns)):
+                proc = ctx.Process(
+                    target=_shm_worker,
+                    args=(work_remote, remote, env_fn, self.shm.name, shape, i),
+                    name=f"zombie-env-{i}",
+                    daemon=True
+                )
+                proc.start()
+                self.processes.append(proc)
+                work_remote.close()
+            self.closed = False
+            # VecEnv.__init__ queries the workers, so it runs after they start
+            super().__init__(n_envs, observation_space, spaces.Discrete(6))
+        except BaseException:
+            # Don't leave workers running or the shared segment behind on a failed start
+            for remote, _ in zip(getattr(self, "remotes", ()), self.processes):
+                try:
+                    remote.send(("close", None))
+                except OSError:
+                    pass
+            for proc in self.processes:
+                proc.join()
+            self.obs = None
+            self.shm.close()
+            self.shm.unlink()
+            raise
+
+    def reset(self):
+        for remote in self.remotes:
+            remote.send(("reset", None))
+        _recv_all(self.remotes)
+        return self.obs.copy()
+
+    def step_async(self, actions):
+        for remote, action in zip(self.remotes, actions):
+            remote.send(("step", int(action)))
+
+    def step_wait(self):
+        results = _recv_all(self.remotes)
+        rewards, dones, infos = zip(*results)
+        # Copy out: SB3 keeps the previous obs around for the replay buffer
+        return self.obs.copy(), np.array(rewards, dtype=np.float32), np.array(dones), list(infos)
+
+    def close(self):
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for proc in self.processes:
+            proc.join()
+        del self.obs
+        self.shm.close()
+        self.shm.unlink()
+        self.closed = True
+
+    def _targets(self, indices):
+        return [self.remotes[i] for i in self._get_indices(indices)]
+
+    def get_attr(self, attr_name, indices=None):
+        targets = self._targets(indices)
+        for remote in targets:
+            remote.send(("get_attr", attr_name))
+        return _recv_all(targets)
+
+    def set_attr(self, attr_name, value, indices=None):
+        targets = self._targets(indices)
+        for remote in targets:
+            remote.send(("set_attr", (attr_name, value)))
+        _recv_all(targets)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        targets = self._targets(indices)
+        for remote in targets:
+            remote.send(("env_method", (method_name, method_args, method_kwargs)))
+        return _recv_all(targets)
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
+
+# --- Throughput Reporting ---
+class StepsPerSecondCallback(BaseCallback):
+    def __init__(self, report_every=5_000, verbose=0):
+        super().__init__(verbose)
+        self.report_every = report_every
+        self.last_report = 0
+
+    def _on_training_start(self):
+        self.start = time.perf_counter()
+
+    def _on_step(self) -> bool:
+        if self.num_timesteps - self.last_report >= self.report_every:
+            sps = self.num_timesteps / (time.perf_counter() - self.start)
+            self.logger.record("time/steps_per_sec", sps)
+            print(f"{self.num_timesteps} steps, {sps:.1f} steps/sec across {self.training_env.num_envs} envs")
+            self.last_report = self.num_timesteps
+        return True
+
 # --- GPT-2 Callback for High-Level Planning ---
 class GPT2Callback(BaseCallback):
     def __init__(self, env, tokenizer, model, verbose=0):
@@ -73,11 +287,16 @@ class GPT2Callback(BaseCallback):
         self.gpt2 = model
         self.memory = deque(maxlen=10)
         self.interval = 1000  # steps between plans
+        self.last_plan = 0
 
     def _on_step(self) -> bool:
-        # Every `interval` steps, get a plan
-        if self.num_timesteps % self.interval == 0:
-            st = self.env.state
+        # Every `interval` steps, get a plan (num_timesteps advances by n_envs per step)
+        if self.num_timesteps - self.last_plan >= self.interval:
+            self.last_plan = self.num_timesteps
+            if isinstance(self.env, VecEnv):
+                st = self.env.get_attr("state", indices=[0])[0]
+            else:
+                st = self.env.state
             prompt = f"Round {st['round']}, ammo {st['ammo']}. Strategy?"
             inputs = self.tokenizer(prompt, return_tensors="pt", local_files_only=True)
             out = self.gpt2.generate(**inputs, max_new_tokens=20, do_sample=False)
@@ -86,18 +305,48 @@ class GPT2Callback(BaseCallback):
         return True
 
 # --- Main entrypoint ---
+def parse_region(text):
+    """Parses 'left,top,width,height' into an mss capture region."""
+    try:
+        left, top, width, height = (int(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected left,top,width,height, got {text!r}")
+    return {"left": left, "top": top, "width": width, "height": height}
+
+def make_env(args):
+    if args.replay:
+        fns = [functools.partial(ReplayZombiesEnv, path) for path in args.replay]
+    elif args.regions:
+        fns = [functools.partial(BlackOpsZombiesEnv, region=r) for r in args.regions]
+    else:
+        fns = [functools.partial(BlackOpsZombiesEnv, monitor=m) for m in args.monitors]
+    if len(fns) == 1:
+        return fns[0]()
+    return SharedMemoryVecEnv(fns)
+
 def main():
+    parser = argparse.ArgumentParser(description="Train the Black Ops Zombies DQN agent.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--monitors", type=int, nargs="+", default=[1],
+                        help="mss monitor index per env; one worker process each")
+    source.add_argument("--regions", type=parse_region, nargs="+",
+                        help="Capture region per env as left,top,width,height (one game window each)")
+    source.add_argument("--replay", nargs="+",
+                        help="Recorded .npy frame files to train on instead of live capture")
+    args = parser.parse_args()
+
     # 1. Wait before starting controls
-    print("Position on game window. Starting in 10 seconds...")
-    time.sleep(10)
+    if not args.replay:
+        print("Position on game window. Starting in 10 seconds...")
+        time.sleep(10)
 
     # 2. Prepare GPT-2 offline
     tokenizer = GPT2TokenizerFast.from_pretrained("./models/gpt2", local_files_only=True)
     gpt2 = GPT2LMHeadModel.from_pretrained("./models/gpt2", local_files_only=True).eval()
 
     # 3. Create env and agent
-    env = BlackOpsZombiesEnv()
-    callback = GPT2Callback(env, tokenizer, gpt2)
+    env = make_env(args)
+    callback = [GPT2Callback(env, tokenizer, gpt2), StepsPerSecondCallback()]
 
     model = DQN(
         "CnnPolicy", env,
@@ -114,8 +363,9 @@ def main():
 
     # 5. Save trained agent & GPT-2 memory
     model.save("frank_castle_dqn")
+    env.close()
     with open("gpt2_memory.txt", "w") as f:
-        for ts, plan in callback.memory:
+        for ts, plan in callback[0].memory:
             f.write(f"{ts}: {plan}\n")
 
 if __name__ == "__main__":